@@ -1,6 +1,5 @@
 import pandas as pd
 import numpy as np
-import random
 import pathlib
 from datetime import timedelta
 
@@ -92,59 +91,90 @@ class Demand_calculation:
         None
         """
         id = 0
-        for minute in time_list:
-            timestep = cfg_dict["start_date"] + timedelta(minutes=minute)
-            demand_now = demand.at[int(timestep.hour), str(timestep.weekday())]
-            seed = random.random()
-            if seed < demand_now * cfg_dict["order_behaviour"]["demand_factor"]:
-                probability = station_probability.loc[timestep.hour]
-                probability_normalized = []
-                for prob in probability:
-                    probability_normalized.append(prob / sum(probability))
-                stations = np.random.choice(
-                    station_probability.columns,
-                    2,
-                    replace=False,
-                    p=probability_normalized,
-                )
-                seed_2 = random.random()
-                if seed_2 < cfg_dict["order_behaviour"]["order_behaviour"]:
-                    # TODO: Noch hardgecoded!
-                    time = timestep - timedelta(minutes=3)
-                else:
-                    # TODO: was schlaues ausdenken um nach Zeit zu ordnen!!
-                    ahead_list = [
-                        *range(
-                            int(cfg_dict["order_behaviour"]["order_ahead_max"]),
-                            int(cfg_dict["order_behaviour"]["order_ahead_max"]) + 1,
-                            1,
-                        )
-                    ]
-                    delta = np.random.choice(ahead_list, 1)
-                    time = timestep - timedelta(minutes=int(delta[0]))
-                # TODO: random choice for passangers
-                # TODO: parse with config parser
-                probability_list = []
-                passangers_probability = [0.61, 0.25, 0.05, 0.05, 0.025, 0.015]
-                seats = []
-                q = 1
-                for i in passangers_probability:
-                    seats.append(q)
-                    probability_list.append(i / sum(passangers_probability))
-                    q += 1
-                passangers = np.random.choice(
-                    seats, 1, replace=False, p=probability_list
-                )
-                request = Request(
-                    stations[0],
-                    stations[1],
-                    id,
-                    timestep,
-                    passangers[0],
-                    time,
-                    cfg_dict["weights"]["delay_max"],
-                    waytime.loc[stations[0], stations[1]],
-                )
-                self.request_list.append(request)
-                id += 1
+        rng = np.random.default_rng()
+        length = len(time_list)
+
+        # normalized station probabilities per hour and the seat distribution
+        # are invariant over the simulated time - compute them only once
+        probability_normalized = station_probability.to_numpy(dtype=np.float64)
+        probability_normalized = probability_normalized / probability_normalized.sum(
+            axis=1, keepdims=True
+        )
+        station_columns = station_probability.columns.to_numpy()
+        # matrix row index per probability column, so every request carries
+        # its integer station ids from the start
+        station_to_idx = {
+            station: i for i, station in enumerate(waytime.index)
+        }
+        column_idx = np.array(
+            [station_to_idx[station] for station in station_columns],
+            dtype=np.intp,
+        )
+        # TODO: random choice for passangers
+        # TODO: parse with config parser
+        seats = np.arange(1, 7)
+        seat_probability = np.array([0.61, 0.25, 0.05, 0.05, 0.025, 0.015])
+        seat_probability = seat_probability / seat_probability.sum()
+
+        # draw all random numbers in bulk instead of one scalar draw per
+        # simulated minute
+        seeds = rng.random(length)
+        seeds_2 = rng.random(length)
+        passangers_all = rng.choice(seats, size=length, p=seat_probability)
+        # TODO: was schlaues ausdenken um nach Zeit zu ordnen!!
+        deltas = rng.integers(
+            int(cfg_dict["order_behaviour"]["order_ahead_min"]),
+            int(cfg_dict["order_behaviour"]["order_ahead_max"]) + 1,
+            size=length,
+        )
+
+        # station pairs via the Gumbel-top-k trick: the two largest keys per
+        # row are a weighted sample of two distinct stations
+        time_arr = np.asarray(time_list, dtype=np.int64)
+        start_min = np.datetime64(cfg_dict["start_date"]).astype("datetime64[m]")
+        minutes = start_min.view(np.int64) + time_arr
+        hours = (minutes // 60) % 24
+        # epoch day zero was a Thursday, weekday 3
+        weekdays = (minutes // 1440 + 3) % 7
+        with np.errstate(divide="ignore"):
+            log_probability = np.log(probability_normalized)
+        keys = -np.log(-np.log(rng.random((length, len(station_columns)))))
+        keys = keys + log_probability[hours]
+        pair_idx = np.argpartition(-keys, 1, axis=1)[:, :2]
+        rows = np.arange(length)
+        swap = keys[rows, pair_idx[:, 1]] > keys[rows, pair_idx[:, 0]]
+        pair_idx[swap] = pair_idx[swap][:, ::-1]
+
+        # vectorized Bernoulli step: accept all minutes in one comparison and
+        # only instantiate requests for the accepted ones; the demand profile
+        # becomes a (24, 7) hour x weekday array indexed with plain ints
+        demand_np = demand[[str(day) for day in range(7)]].to_numpy(
+            dtype=np.float64
+        )
+        demand_vec = demand_np[hours, weekdays]
+        accept = seeds < demand_vec * cfg_dict["order_behaviour"]["demand_factor"]
+
+        for i in np.flatnonzero(accept):
+            timestep = cfg_dict["start_date"] + timedelta(minutes=int(time_arr[i]))
+            stations = station_columns[pair_idx[i]]
+            station_idxs = column_idx[pair_idx[i]]
+            if seeds_2[i] < cfg_dict["order_behaviour"]["order_behaviour"]:
+                # TODO: Noch hardgecoded!
+                time = timestep - timedelta(minutes=3)
+            else:
+                time = timestep - timedelta(minutes=int(deltas[i]))
+            request = Request(
+                stations[0],
+                stations[1],
+                id,
+                timestep,
+                passangers_all[i],
+                time,
+                cfg_dict["weights"]["delay_max"],
+                waytime.loc[stations[0], stations[1]],
+                int(station_idxs[0]),
+                int(station_idxs[1]),
+            )
+            self.request_list.append(request)
+            id += 1
 
@@ -1,5 +1,328 @@
-import pandas as pd
+import time
+
+import numpy as np
 from datetime import timedelta
+from joblib import Parallel, delayed
+from numba import njit
+
+
+@njit(cache=True)
+def _propagate(
+    station_idx,
+    boarding,
+    promissed,
+    planed,
+    delay,
+    occupation,
+    waytime_np,
+    standing_time,
+    base,
+    delay_max,
+    seats,
+):
+    """
+    Propagate planned times, delays and occupation through a schedule.
+
+    Fills the planed, delay and occupation arrays in place from the window
+    start onwards. Delays wrap around at one day, matching the behaviour of
+    ``timedelta.seconds // 60`` which the delay bookkeeping is based on.
+    Propagation stops at the first stop violating the delay, seat or
+    boarding-order constraint, since a single violation already
+    disqualifies the candidate.
+
+    Parameters
+    ----------
+    station_idx : np.ndarray
+        Station row indices per stop into the waytime matrix.
+    boarding : np.ndarray
+        Number of passengers boarding per stop.
+    promissed : np.ndarray
+        Promised arrival times in whole minutes since the epoch.
+    planed : np.ndarray
+        Planned arrival times in whole minutes since the epoch, updated in
+        place.
+    delay : np.ndarray
+        Delays in minutes, updated in place.
+    occupation : np.ndarray
+        Occupation per stop, updated in place.
+    waytime_np : np.ndarray
+        Waytime matrix between stations in whole minutes.
+    standing_time : int
+        Standing time per stop in minutes.
+    base : int
+        First stop of the schedule window to propagate from.
+    delay_max : int
+        Maximum allowed delay per stop in minutes.
+    seats : int
+        Number of seats of the vehicle.
+
+    Returns
+    -------
+    bool
+        False if any stop violates the delay, seat or boarding-order
+        constraint, True otherwise.
+
+    """
+    length = station_idx.shape[0]
+    # the first window row keeps its planned time and occupation; only its
+    # delay is refreshed before the loop starts at the second row
+    delay[base] = (planed[base] - promissed[base]) % 1440
+    if delay[base] > delay_max or occupation[base] > seats:
+        return False
+    for i in range(base + 1, length):
+        occupation[i] = occupation[i - 1] + boarding[i]
+        planed[i] = (
+            planed[i - 1]
+            + waytime_np[station_idx[i - 1], station_idx[i]]
+            + standing_time
+        )
+        delay[i] = (planed[i] - promissed[i]) % 1440
+        if delay[i] > delay_max or occupation[i] > seats:
+            return False
+
+        # check: letting people get out, bevor letting new in
+        if (
+            i + 1 < length
+            and station_idx[i] == station_idx[i + 1]
+            and boarding[i] > 0
+            and boarding[i + 1] < 0
+        ):
+            return False
+    return True
+
+
+def _materialize_candidate(
+    schedule, start_position, destination_position, request, start_min,
+    promissed_destination,
+):
+    """
+    Build a candidate schedule with the request inserted at the given positions.
+
+    Parameters
+    ----------
+    schedule : ScheduleSoA
+        The vehicle schedule the request is inserted into.
+    start_position : int
+        Position of the pick-up stop.
+    destination_position : int
+        Position of the drop-off stop, relative to the schedule before
+        insertion.
+    request : Request
+        The ride request to insert.
+    start_min : int
+        Requested start time in whole minutes since the epoch.
+    promissed_destination : int
+        Promised drop-off time in whole minutes since the epoch.
+
+    Returns
+    -------
+    ScheduleSoA
+        The candidate schedule including both stops of the request.
+
+    """
+    # with both positions referring to the schedule before insertion, one
+    # np.insert per column places the start at start_position and the
+    # destination right behind destination_position
+    return schedule.insert_stops(
+        [start_position, destination_position],
+        [request.start, request.destination],
+        [request.start_idx, request.destination_idx],
+        [request.passangers, -request.passangers],
+        [start_min, promissed_destination],
+        [request.request_id, request.request_id],
+        [start_min, start_min],
+        [request.passangers, -request.passangers],
+        [request.delay_max_min, request.delay_max_min],
+    )
+
+
+def _candidate_distance_delta(
+    station_idx, base, start_position, destination_position, distance_np
+):
+    """
+    Calculate the distance change caused by the two inserted stops.
+
+    Only the edges around the inserted stops differ from the schedule before
+    insertion, so the delta is a constant number of matrix lookups.
+
+    Parameters
+    ----------
+    station_idx : np.ndarray
+        Station row indices of the candidate schedule.
+    base : int
+        First stop of the schedule window.
+    start_position : int
+        Position of the pick-up stop in the candidate schedule.
+    destination_position : int
+        Position of the drop-off stop, relative to the schedule before
+        insertion.
+    distance_np : np.ndarray
+        Distance matrix between stations.
+
+    Returns
+    -------
+    float
+        The added distance compared to the schedule before insertion.
+
+    """
+    length = len(station_idx)
+    j_start = start_position
+    j_dest = destination_position + 1
+    if j_dest == j_start + 1:
+        previous = j_start - 1 if j_start - 1 >= base else None
+        following = j_dest + 1 if j_dest + 1 < length else None
+        delta = distance_np[station_idx[j_start], station_idx[j_dest]]
+        if previous is not None:
+            delta += distance_np[station_idx[previous], station_idx[j_start]]
+        if following is not None:
+            delta += distance_np[station_idx[j_dest], station_idx[following]]
+        if previous is not None and following is not None:
+            delta -= distance_np[station_idx[previous], station_idx[following]]
+    else:
+        delta = 0.0
+        for j in (j_start, j_dest):
+            previous = j - 1 if j - 1 >= base else None
+            following = j + 1 if j + 1 < length else None
+            if previous is not None:
+                delta += distance_np[station_idx[previous], station_idx[j]]
+            if following is not None:
+                delta += distance_np[station_idx[j], station_idx[following]]
+            if previous is not None and following is not None:
+                delta -= distance_np[station_idx[previous], station_idx[following]]
+    return float(delta)
+
+
+def _insertion_positions(schedule, start_min, promissed_limit, cutoff):
+    """
+    Determine the insertion positions to try for a request.
+
+    Parameters
+    ----------
+    schedule : ScheduleSoA
+        The vehicle schedule the request should be inserted into.
+    start_min : int
+        Requested start time in whole minutes since the epoch.
+    promissed_limit : int
+        Latest promised time still relevant for insertions, in whole minutes
+        since the epoch.
+    cutoff : int
+        Planned time in whole minutes since the epoch from which on stops
+        are relevant.
+
+    Returns
+    -------
+    tuple of (int, int, list or None)
+        The window start, the delay of the schedule window before insertion
+        and the (start, destination) position pairs to try. The position
+        list is None when the schedule window contains no relevant stop.
+
+    """
+    # planed is kept time-sorted by the propagation, so the window start is
+    # found by binary search instead of scanning the whole column
+    base = int(np.searchsorted(schedule.planed, cutoff, side="right"))
+    if base == len(schedule):
+        # vehicle has no upcoming stops - append the request at the end
+        return base, 0, [(base, base)]
+    delay_old = int(schedule.delay[base:].sum())
+    relevant = np.flatnonzero(schedule.promissed[base:] < promissed_limit)
+    if len(relevant) == 0:
+        return base, delay_old, None
+    last = base + int(relevant[-1]) + 1
+    positions = [
+        (start_position, destination_position)
+        for start_position in range(base, last + 1)
+        for destination_position in range(start_position, last + 1)
+    ]
+    return base, delay_old, positions
+
+
+def _eval_vehicle(
+    schedule, seats, request, cfg_dict, waytime_np, distance_np, waytime_max
+):
+    """
+    Evaluate all feasible insertions of a request into one vehicle schedule.
+
+    Module-level worker so it can run in a joblib process pool; only the
+    schedule arrays and plain metric dictionaries cross the pickle boundary.
+
+    Parameters
+    ----------
+    schedule : ScheduleSoA
+        The vehicle schedule the request should be inserted into.
+    seats : int
+        Number of seats of the vehicle.
+    request : Request
+        The ride request to insert.
+    cfg_dict : dict
+        A dictionary containing configuration data for the simulation.
+    waytime_np : np.ndarray
+        Waytime matrix between stations in whole minutes.
+    distance_np : np.ndarray
+        Distance matrix between stations.
+    waytime_max : int
+        Largest waytime between any two stations in minutes.
+
+    Returns
+    -------
+    tuple of (list, bool)
+        The feasible candidates as metric dictionaries and a flag mirroring
+        the serial early exit when the schedule window holds no relevant
+        stop.
+
+    """
+    standing_time = int(cfg_dict["weights"]["standing_time"])
+    delay_max = int(cfg_dict["weights"]["delay_max"])
+    start_min = request.start_min
+    promissed_limit = start_min + request.waytime_min + delay_max
+    promissed_destination = start_min + request.waytime_min + standing_time
+    cutoff = start_min - (waytime_max + 5)
+    base, delay_old, positions = _insertion_positions(
+        schedule, start_min, promissed_limit, cutoff
+    )
+    if positions is None:
+        return [], True
+    candidates = []
+    for start_position, destination_position in positions:
+        candidate = _materialize_candidate(
+            schedule,
+            start_position,
+            destination_position,
+            request,
+            start_min,
+            promissed_destination,
+        )
+        length = len(candidate)
+        station_idx = candidate.station_idx
+        feasible = _propagate(
+            station_idx,
+            candidate.boarding,
+            candidate.promissed,
+            candidate.planed,
+            candidate.delay,
+            candidate.occupation,
+            waytime_np,
+            standing_time,
+            base,
+            delay_max,
+            seats,
+        )
+        if not feasible:
+            continue
+        candidates.append(
+            {
+                "positions": (start_position, destination_position),
+                "window_start": base,
+                "delay_old": delay_old,
+                "delay": int(candidate.delay[base:].sum()) - delay_old,
+                "distance": _candidate_distance_delta(
+                    station_idx, base, start_position, destination_position,
+                    distance_np,
+                ),
+                "pooling_rate": candidate.occupation[base:].sum()
+                / (length - base),
+            }
+        )
+    return candidates, False
 
 
 class Pooling:
@@ -17,14 +340,22 @@ class Pooling:
 
     Methods
     -------
+    evaluating_request(vehicle_list, request, cfg_dict)
+        Generate and check the candidate schedules for one request.
+    process_batch(vehicle_list, batch, cfg_dict)
+        Schedule all requests of one time bucket with conflict resolution.
     creating_possible_schedules(vehicle_list, request, schedule_dictionary, cfg_dict)
         Create possible ride schedules for a given request.
-    check_occupation_delay(schedule_dictionary, waytime, cfg_dict)
+    creating_schedules_parallel(vehicle_list, request, schedule_dictionary, cfg_dict, n_jobs)
+        Create and check ride schedules with one worker per vehicle.
+    check_occupation_delay(schedule_dictionary, request, cfg_dict)
         Check the occupation and delay for ride schedules.
+    apply_insertion(entry, request, cfg_dict)
+        Materialize and propagate the schedule of a winning entry.
     calculate_score(schedule_dictionary, cfg_dict)
         Calculate a score for each ride schedule.
-    calculating_distance(schedule)
-        Calculate the distance traveled for a given schedule.
+    calculating_distance(stations)
+        Calculate the distance traveled along a station sequence.
     """
     def __init__(self, vehicle_list, request_list, cfg_dict, waytime, distance):
         """
@@ -49,34 +380,180 @@ class Pooling:
 
         """
         self.distance = distance
-        self.waytime_max = waytime.values.max()
+        # cache the matrices as plain ndarrays plus a station -> row index
+        # mapping, so the hot loops can gather instead of doing pandas
+        # label lookups per element
+        self.station_index = {sid: i for i, sid in enumerate(distance.index)}
+        self.distance_np = distance.to_numpy(dtype=np.float64)
+        self.waytime_np = np.ceil(waytime.to_numpy()).astype(np.int32)
+        self.waytime_max = int(self.waytime_np.max())
         self.requests_denied_list = []
+        self.n_jobs = cfg_dict.get("n_jobs", 1)
+        self.parallel = self.n_jobs != 1 and len(vehicle_list) > 1
+        batch_interval = cfg_dict.get("batch_interval", 0.0)
         counter = 0
-        for request in request_list:
-            print(
-                "\r"
-                + str(int(counter / (len(request_list) - 1) * 100))
-                + " % completed   ",
-                end=" ",
-                flush=True,
-            ),
-            self.schedule_dictionary = {}
-            self.schedule_dictionary = self.creating_possible_schedules(
-                vehicle_list, request, self.schedule_dictionary, cfg_dict
-            )
-            self.schedule_dictionary = self.check_occupation_delay(
-                self.schedule_dictionary, waytime, cfg_dict
+
+        # terminal I/O is surprisingly expensive - update the progress line
+        # at most once per percent or once per quarter second
+        print_step = max(1, len(request_list) // 100)
+        last_print = -print_step
+        last_time = time.monotonic()
+        if batch_interval > 0:
+            # collect requests starting within one interval and dispatch them
+            # as a batch with conflict resolution
+            request_list = sorted(
+                request_list, key=lambda request: request.start_time
             )
-            if len(self.schedule_dictionary) != 0:
-                self.best_schedule = self.calculate_score(
-                    self.schedule_dictionary, cfg_dict
+            interval = timedelta(seconds=batch_interval)
+            batches = []
+            batch = []
+            batch_end = None
+            for request in request_list:
+                if len(batch) != 0 and request.start_time >= batch_end:
+                    batches.append(batch)
+                    batch = []
+                if len(batch) == 0:
+                    batch_end = request.start_time + interval
+                batch.append(request)
+            if len(batch) != 0:
+                batches.append(batch)
+            for batch in batches:
+                self.process_batch(vehicle_list, batch, cfg_dict)
+                counter += len(batch)
+                if (
+                    counter - last_print >= print_step
+                    or time.monotonic() - last_time > 0.25
+                ):
+                    print(
+                        "\r"
+                        + str(int(counter / len(request_list) * 100))
+                        + " % completed   ",
+                        end=" ",
+                        flush=True,
+                    )
+                    last_print = counter
+                    last_time = time.monotonic()
+        else:
+            for request in request_list:
+                if (
+                    counter - last_print >= print_step
+                    or time.monotonic() - last_time > 0.25
+                ):
+                    print(
+                        "\r"
+                        + str(int(counter / (len(request_list) - 1) * 100))
+                        + " % completed   ",
+                        end=" ",
+                        flush=True,
+                    )
+                    last_print = counter
+                    last_time = time.monotonic()
+                schedule_dictionary = self.evaluating_request(
+                    vehicle_list, request, cfg_dict
                 )
-                self.best_schedule["vehicle"].update_schedule(
-                    self.best_schedule["schedule"]
+                if len(schedule_dictionary) != 0:
+                    best_schedule = self.calculate_score(
+                        schedule_dictionary, cfg_dict
+                    )
+                    if self.parallel:
+                        # only the winning insertion is materialized on the
+                        # main process
+                        best_schedule["schedule"] = self.apply_insertion(
+                            best_schedule, request, cfg_dict
+                        )
+                    best_schedule["vehicle"].update_schedule(
+                        best_schedule["schedule"]
+                    )
+                else:
+                    self.requests_denied_list.append(request)
+                counter += 1
+        print("\r100 % completed   ", end=" ", flush=True)
+
+    def evaluating_request(self, vehicle_list, request, cfg_dict):
+        """
+        Generate and check the candidate schedules for one request.
+
+        Parameters
+        ----------
+        vehicle_list : list
+            A list of vehicle objects participating in the simulation.
+        request : Request
+            A ride request object.
+        cfg_dict : dict
+            A dictionary containing configuration data for the simulation.
+
+        Returns
+        -------
+        dict
+            The schedule dictionary holding the surviving candidates.
+
+        """
+        # a local dictionary instead of an instance attribute - requests do
+        # not share candidate state
+        if self.parallel:
+            schedule_dictionary = self.creating_schedules_parallel(
+                vehicle_list, request, {}, cfg_dict, self.n_jobs
+            )
+        else:
+            schedule_dictionary = self.creating_possible_schedules(
+                vehicle_list, request, {}, cfg_dict
+            )
+            schedule_dictionary = self.check_occupation_delay(
+                schedule_dictionary, request, cfg_dict
+            )
+        return schedule_dictionary
+
+    def process_batch(self, vehicle_list, batch, cfg_dict):
+        """
+        Schedule all requests of one time bucket with conflict resolution.
+
+        Every pending request is evaluated against the current vehicle
+        schedules; the best insertion per vehicle is accepted and requests
+        losing their vehicle to a better scored one are re-planned against
+        the updated schedules in the next iteration.
+
+        Parameters
+        ----------
+        vehicle_list : list
+            A list of vehicle objects participating in the simulation.
+        batch : list
+            The ride requests starting within one batch interval.
+        cfg_dict : dict
+            A dictionary containing configuration data for the simulation.
+
+        Returns
+        -------
+        None
+
+        """
+        pending = list(batch)
+        while len(pending) != 0:
+            proposals = []
+            for request in pending:
+                schedule_dictionary = self.evaluating_request(
+                    vehicle_list, request, cfg_dict
                 )
-            else:
-                self.requests_denied_list.append(request)
-            counter += 1
+                if len(schedule_dictionary) != 0:
+                    proposals.append(
+                        (request, self.calculate_score(schedule_dictionary, cfg_dict))
+                    )
+                else:
+                    self.requests_denied_list.append(request)
+            if len(proposals) == 0:
+                break
+
+            # accept the best scored insertion per vehicle
+            proposals.sort(key=lambda proposal: proposal[1]["score"], reverse=True)
+            taken = set()
+            pending = []
+            for request, best in proposals:
+                vehicle = best["vehicle"]
+                if vehicle.id in taken:
+                    pending.append(request)
+                    continue
+                taken.add(vehicle.id)
+                best["schedule"] = self.apply_insertion(best, request, cfg_dict)
+                vehicle.update_schedule(best["schedule"])
 
     def creating_possible_schedules(
         self, vehicle_list, request, schedule_dictionary, cfg_dict
@@ -105,178 +582,164 @@ class Pooling:
 
         """
         id = 0
+        start_min = request.start_min
+        promissed_limit = (
+            start_min + request.waytime_min + request.delay_max_min
+        )
+        cutoff = start_min - (self.waytime_max + 5)
         for vehicle in vehicle_list:
-            # getting relevant schedule
-            schedule = vehicle.schedule.loc[
-                vehicle.schedule["planed"]
-                > (request.start_time - timedelta(minutes=float(float(self.waytime_max) + 5.0)))
-            ]
-
-            # creating start and destination frame
-            start_frame = pd.DataFrame(
-                [
-                    [
-                        request.start,
-                        request.passangers,
-                        request.start_time,
-                        request.request_id,
-                        request.start_time,
-                        0,
-                        request.passangers,
-                        request.delay_max,
-                    ]
-                ],
-                columns=[
-                    "station",
-                    "boarding",
-                    "promissed_time",
-                    "request_id",
-                    "planed",
-                    "delay",
-                    "occupation",
-                    "max_delay",
-                ],
-                index=[1],
+            schedule = vehicle.schedule
+            base, delay_old, positions = _insertion_positions(
+                schedule, start_min, promissed_limit, cutoff
             )
-            destination_frame = pd.DataFrame(
-                [
-                    [
-                        request.destination,
-                        -request.passangers,
-                        request.start_time + timedelta(minutes=request.waytime) + timedelta(minutes=cfg_dict["weights"]["standing_time"]),
-                        request.request_id,
-                        request.start_time,
-                        0,
-                        -request.passangers,
-                        request.delay_max,
-                    ]
-                ],
-                columns=[
-                    "station",
-                    "boarding",
-                    "promissed_time",
-                    "request_id",
-                    "planed",
-                    "delay",
-                    "occupation",
-                    "max_delay",
-                ],
-                index=[2],
-            )
-
-            # putting together a schedule
-            if len(schedule) == 0:
-                schedule = pd.concat([start_frame, destination_frame])
-                schedule.sort_index()
-                index_final = pd.Series(
-                    [len(vehicle.schedule) + 1, len(vehicle.schedule) + 2]
-                )
-                schedule = schedule.set_index(index_final)
-                entry = {
-                    id: {
-                        "vehicle": vehicle,
-                        "delay_old": 0,
-                        "distance_old": 0,
-                        "schedule": schedule,
-                        "balance": len(vehicle.schedule),
-                        "pooling_rate": 0,
-                        "delay": 0,
-                        "distance": 0,
-                        "delay_score": 0,
-                        "pooling_score": 0,
-                        "balance_score": 0,
-                        "distance_score": 0,
-                        "score": 0,
-                    }
-                }
+            if positions is None:
+                break
+
+            # everything except the insertion positions is shared between the
+            # candidates of one vehicle; the schedule itself is materialized
+            # lazily in check_occupation_delay
+            base_entry = {
+                "vehicle": vehicle,
+                "delay_old": delay_old,
+                "schedule": schedule,
+                "window_start": base,
+                "balance": len(vehicle.schedule),
+                "pooling_rate": 0,
+                "delay": 0,
+                "distance": 0,
+                "delay_score": 0,
+                "pooling_score": 0,
+                "balance_score": 0,
+                "distance_score": 0,
+                "score": 0,
+            }
+            for start_position, destination_position in positions:
+                entry = dict(base_entry)
+                entry["positions"] = (start_position, destination_position)
+                schedule_dictionary[id] = entry
                 id += 1
+        return schedule_dictionary
 
-                schedule_dictionary.update(entry)
-            else:
-                # getting relevant index:
-                index_final_start = min(schedule.index)
-                index_new = [*range(1, len(schedule) + 1, 1)]
-                delay_old = schedule["delay"].sum()
-                distance_old = self.calculating_distance(schedule)
-                new_list = []
-                for i in index_new:
-                    new_list.append(i * 3)
-                index_new = new_list
-                schedule = schedule.set_index(pd.Series(index_new))
-                index_relevant = []
-                for i in schedule.index:
-                    if schedule.at[i, "promissed_time"] < (
-                        request.start_time
-                        + timedelta(minutes=request.waytime)
-                        + timedelta(minutes=cfg_dict["weights"]["delay_max"])
-                    ):
-                        index_relevant.append(i)
-                start_loop = 1
-                if len(index_relevant) == 0:
-                    break
-                while start_loop < (max(index_relevant) + 3):
-                    destination_loop = start_loop + 1
-                    while destination_loop < (max(index_relevant) + 3):
-                        entry = {
-                            id: {
-                                "vehicle": vehicle,
-                                "delay_old": delay_old,
-                                "distance_old": distance_old,
-                                "schedule": schedule,
-                                "balance": len(vehicle.schedule),
-                                "pooling_rate": 0,
-                                "delay": 0,
-                                "distance": 0,
-                                "delay_score": 0,
-                                "pooling_score": 0,
-                                "balance_score": 0,
-                                "distance_score": 0,
-                                "score": 0,
-                            }
-                        }
-
-                        # give new index
-                        start_frame = start_frame.set_index(pd.Series([start_loop]))
-                        destination_frame = destination_frame.set_index(
-                            pd.Series([destination_loop])
-                        )
+    def creating_schedules_parallel(
+        self, vehicle_list, request, schedule_dictionary, cfg_dict, n_jobs
+    ):
+        """
+        Create and check schedules with one worker per vehicle.
 
-                        # put together
-                        schedule_1 = pd.concat(
-                            [schedule, start_frame, destination_frame]
-                        )
-                        schedule_1 = schedule_1.sort_index()
-                        # index_final = pd.Series(
-                        # list(range(len(vehicle.schedule), len(schedule) + 2))
-                        # )
-                        index_final = [
-                            *range(
-                                index_final_start,
-                                len(schedule_1) + index_final_start,
-                                1,
-                            )
-                        ]
-                        schedule_1 = schedule_1.set_index(pd.Series(index_final))
-                        entry[id]["schedule"] = schedule_1
-                        schedule_dictionary.update(entry)
-                        id += 1
-                        destination_loop += 3
-                    start_loop += 3
+        The per-vehicle candidate evaluation is independent across vehicles,
+        so it is farmed out to a joblib process pool. Workers only return
+        metric dictionaries; the winning schedule is materialized afterwards
+        via apply_insertion.
+
+        Parameters
+        ----------
+        vehicle_list : list
+            A list of vehicle objects participating in the simulation.
+        request : Request
+            A ride request object.
+        schedule_dictionary : dict
+            A dictionary storing schedule entries.
+        cfg_dict : dict
+            A dictionary containing configuration data for the simulation.
+        n_jobs : int
+            Number of joblib workers.
+
+        Returns
+        -------
+        dict
+            Updated schedule dictionary.
+
+        """
+        results = Parallel(n_jobs=n_jobs, prefer="processes", batch_size="auto")(
+            delayed(_eval_vehicle)(
+                vehicle.schedule,
+                vehicle.seats,
+                request,
+                cfg_dict,
+                self.waytime_np,
+                self.distance_np,
+                self.waytime_max,
+            )
+            for vehicle in vehicle_list
+        )
+        id = 0
+        for vehicle, (candidates, stop) in zip(vehicle_list, results):
+            for candidate in candidates:
+                entry = dict(candidate)
+                entry["vehicle"] = vehicle
+                entry["schedule"] = vehicle.schedule
+                entry["balance"] = len(vehicle.schedule)
+                entry["delay_score"] = 0
+                entry["pooling_score"] = 0
+                entry["balance_score"] = 0
+                entry["distance_score"] = 0
+                entry["score"] = 0
+                schedule_dictionary[id] = entry
+                id += 1
+            if stop:
+                break
         return schedule_dictionary
 
-    def check_occupation_delay(self, schedule_dictionary, waytime, cfg_dict):
+    def apply_insertion(self, entry, request, cfg_dict):
+        """
+        Materialize and propagate the schedule of a winning entry.
+
+        Parameters
+        ----------
+        entry : dict
+            A schedule entry holding the vehicle and insertion positions.
+        request : Request
+            The ride request belonging to the entry.
+        cfg_dict : dict
+            A dictionary containing configuration data for the simulation.
+
+        Returns
+        -------
+        ScheduleSoA
+            The propagated schedule including the request.
+
+        """
+        standing_time = int(cfg_dict["weights"]["standing_time"])
+        start_min = request.start_min
+        promissed_destination = start_min + request.waytime_min + standing_time
+        start_position, destination_position = entry["positions"]
+        schedule = _materialize_candidate(
+            entry["vehicle"].schedule,
+            start_position,
+            destination_position,
+            request,
+            start_min,
+            promissed_destination,
+        )
+        _propagate(
+            schedule.station_idx,
+            schedule.boarding,
+            schedule.promissed,
+            schedule.planed,
+            schedule.delay,
+            schedule.occupation,
+            self.waytime_np,
+            standing_time,
+            entry["window_start"],
+            int(cfg_dict["weights"]["delay_max"]),
+            entry["vehicle"].seats,
+        )
+        return schedule
+
+    def check_occupation_delay(self, schedule_dictionary, request, cfg_dict):
         """
         Check vehicle occupation and delay for generated schedules.
 
-        This function checks the occupation and delay of vehicles in generated schedules
-        and removes schedules that exceed maximum occupation or delay.
+        This function materializes the candidate schedules from their
+        insertion positions, checks the occupation and delay of vehicles and
+        removes schedules that exceed maximum occupation or delay.
 
         Parameters
         ----------
         schedule_dictionary : dict
             A dictionary storing schedule entries.
-        waytime : pd.DataFrame
-            A DataFrame representing waytime data between stations.
+        request : Request
+            The ride request the candidates were generated for.
         cfg_dict : dict
             A dictionary containing configuration data for the simulation.
 
@@ -286,68 +749,58 @@ class Pooling:
             Updated schedule dictionary.
 
         """
-        delete_array = []
+        delete_set = set()
+        standing_time = int(cfg_dict["weights"]["standing_time"])
+        delay_max = int(cfg_dict["weights"]["delay_max"])
+        start_min = request.start_min
+        promissed_destination = start_min + request.waytime_min + standing_time
         for entry in schedule_dictionary:
-            schedule = schedule_dictionary[entry]["schedule"]
-            index_list = schedule.index
-            for index in schedule.index:
-                if index == index_list[0]:
-                    schedule.at[index, "occupation"] = schedule.at[index, "occupation"]
-                    schedule.at[index, "delay"] = int(
-                        (
-                            schedule.at[index, "planed"]
-                            - schedule.at[index, "promissed_time"]
-                        ).seconds
-                        // 60
-                    )
-                else:
-                    schedule.at[index, "occupation"] = (
-                        schedule.at[index - 1, "occupation"]
-                        + schedule.at[index, "boarding"]
-                    )
-                    time_delta = timedelta(
-                        minutes=float(
-                            waytime.loc[
-                                schedule.at[index - 1, "station"],
-                                schedule.at[index, "station"],
-                            ]
-                        )
-                    )
-                    standing_time = timedelta(minutes=cfg_dict["weights"]["standing_time"])
-                    schedule.at[index, "planed"] = (
-                        schedule.at[index - 1, "planed"] + time_delta + standing_time
-                    )
-                    schedule.at[index, "delay"] = int(
-                        (
-                            schedule.at[index, "planed"]
-                            - schedule.at[index, "promissed_time"]
-                        ).seconds
-                        // 60
-                    )
+            base = schedule_dictionary[entry]["window_start"]
+            start_position, destination_position = schedule_dictionary[entry][
+                "positions"
+            ]
 
-                    # check: letting people get out, bevor letting new in
-                    if index + 1 in schedule.index:
-                        if (
-                            schedule.at[index, "station"]
-                            == schedule.at[index + 1, "station"]
-                            and schedule.at[index, "boarding"] > 0
-                            and schedule.at[index + 1, "boarding"] < 0
-                        ):
-                            if entry not in delete_array:
-                                delete_array.append(entry)
-            schedule_dictionary[entry]["pooling_rate"] = schedule[
-                "occupation"
-            ].sum() / len(schedule)
-            if (
-                schedule["delay"].max() > cfg_dict["weights"]["delay_max"]
-                or schedule["occupation"].max()
-                > schedule_dictionary[entry]["vehicle"].seats
-            ):
-                if entry not in delete_array:
-                    delete_array.append(entry)
-            else:
-                schedule_dictionary[entry]["schedule"] = schedule
-        for entry in delete_array:
+            # putting together the candidate schedule
+            schedule = _materialize_candidate(
+                schedule_dictionary[entry]["schedule"],
+                start_position,
+                destination_position,
+                request,
+                start_min,
+                promissed_destination,
+            )
+            schedule_dictionary[entry]["schedule"] = schedule
+            length = len(schedule)
+            station_idx = schedule.station_idx
+            feasible = _propagate(
+                station_idx,
+                schedule.boarding,
+                schedule.promissed,
+                schedule.planed,
+                schedule.delay,
+                schedule.occupation,
+                self.waytime_np,
+                standing_time,
+                base,
+                delay_max,
+                schedule_dictionary[entry]["vehicle"].seats,
+            )
+            if not feasible:
+                delete_set.add(entry)
+                continue
+
+            schedule_dictionary[entry]["distance"] = _candidate_distance_delta(
+                station_idx, base, start_position, destination_position,
+                self.distance_np,
+            )
+            schedule_dictionary[entry]["delay"] = (
+                int(schedule.delay[base:].sum())
+                - schedule_dictionary[entry]["delay_old"]
+            )
+            schedule_dictionary[entry]["pooling_rate"] = schedule.occupation[
+                base:
+            ].sum() / (length - base)
+        for entry in delete_set:
             del schedule_dictionary[entry]
         return schedule_dictionary
 
@@ -371,98 +824,65 @@ class Pooling:
             Information about the best schedule.
 
         """
-        # calculating delay_score
-        delay_list = []
-        for entry in schedule_dictionary:
-            delay = (
-                schedule_dictionary[entry]["schedule"]["delay"].sum()
-                - schedule_dictionary[entry]["delay_old"]
-            )
-            schedule_dictionary[entry]["delay"] = delay
-            delay_list.append(delay)
-        for entry in schedule_dictionary:
-            if max(delay_list) == 0:
-                schedule_dictionary[entry]["delay_score"] = 1
-            else:
-                schedule_dictionary[entry]["delay_score"] = 1 - schedule_dictionary[
-                    entry
-                ]["delay"] / max(delay_list)
-
-        # calculating balance
-        balance_list = []
-        for entry in schedule_dictionary:
-            balance_list.append(len(schedule_dictionary[entry]["vehicle"].schedule))
-        for entry in schedule_dictionary:
-            if max(balance_list) == 0:
-                schedule_dictionary[entry]["balance_score"] = 1
-            else:
-                schedule_dictionary[entry]["balance_score"] = 1 - len(
-                    schedule_dictionary[entry]["vehicle"].schedule
-                ) / max(balance_list)
-
-        # Calculating pooling score
-        pooling_list = []
-        for entry in schedule_dictionary:
-            pooling_list.append(schedule_dictionary[entry]["pooling_rate"])
-        for entry in schedule_dictionary:
-            if max(pooling_list) == 0:
-                schedule_dictionary[entry]["pooling_score"] = 0
-            else:
-                schedule_dictionary[entry]["pooling_score"] = schedule_dictionary[
-                    entry
-                ]["pooling_rate"] / max(pooling_list)
-
-        # calculating distance_score
-        distance_list = []
-        for entry in schedule_dictionary:
-            distance_new = self.calculating_distance(
-                schedule_dictionary[entry]["schedule"]
-            )
-            schedule_dictionary[entry]["distance"] = (
-                distance_new - schedule_dictionary[entry]["distance_old"]
-            )
-            distance_list.append(
-                distance_new - schedule_dictionary[entry]["distance_old"]
-            )
-        for entry in schedule_dictionary:
-            if max(distance_list) == 0:
-                schedule_dictionary[entry]["distance_score"] = 1
-            else:
-                schedule_dictionary[entry]["distance_score"] = 1 - (
-                    schedule_dictionary[entry]["distance"] / max(distance_list)
-                )
+        # gather the four metrics into arrays in one pass
+        entries = list(schedule_dictionary.values())
+        count = len(entries)
+        delays = np.empty(count, dtype=np.float64)
+        balances = np.empty(count, dtype=np.float64)
+        poolings = np.empty(count, dtype=np.float64)
+        distances = np.empty(count, dtype=np.float64)
+        for i, entry in enumerate(entries):
+            delays[i] = entry["delay"]
+            balances[i] = len(entry["vehicle"].schedule)
+            poolings[i] = entry["pooling_rate"]
+            distances[i] = entry["distance"]
+
+        # normalize each metric against its maximum and combine the scores;
+        # every maximum is computed exactly once per request
+        delay_top = delays.max()
+        delay_scores = (
+            np.ones(count) if delay_top == 0 else 1 - delays / delay_top
+        )
+        balance_top = balances.max()
+        balance_scores = (
+            np.ones(count) if balance_top == 0 else 1 - balances / balance_top
+        )
+        pooling_top = poolings.max()
+        pooling_scores = (
+            np.zeros(count) if pooling_top == 0 else poolings / pooling_top
+        )
+        distance_top = distances.max()
+        distance_scores = (
+            np.ones(count) if distance_top == 0 else 1 - distances / distance_top
+        )
+        scores = (
+            delay_scores * cfg_dict["weights"]["delay_factor"]
+            + balance_scores * cfg_dict["weights"]["balance_factor"]
+            + pooling_scores * cfg_dict["weights"]["pooling_factor"]
+            + distance_scores * cfg_dict["weights"]["distance_factor"]
+        )
 
         # pick best schedule
-        score_list = []
-        entry_list = []
-        for entry in schedule_dictionary:
-            score = (
-                schedule_dictionary[entry]["delay_score"]
-                * cfg_dict["weights"]["delay_factor"]
-                + schedule_dictionary[entry]["balance_score"]
-                * cfg_dict["weights"]["balance_factor"]
-                + schedule_dictionary[entry]["pooling_score"]
-                * cfg_dict["weights"]["pooling_factor"]
-                + schedule_dictionary[entry]["distance_score"]
-                * cfg_dict["weights"]["distance_factor"]
-            )
-            entry_list.append(entry)
-            schedule_dictionary[entry]["score"] = score
-            score_list.append(score)
-        index_best_schedule = score_list.index(max(score_list))
-        best_entry = schedule_dictionary[entry_list[index_best_schedule]]
+        for i, entry in enumerate(entries):
+            entry["delay_score"] = delay_scores[i]
+            entry["balance_score"] = balance_scores[i]
+            entry["pooling_score"] = pooling_scores[i]
+            entry["distance_score"] = distance_scores[i]
+            entry["score"] = scores[i]
+        best_entry = entries[int(scores.argmax())]
         return best_entry
 
-    def calculating_distance(self, schedule):
+    def calculating_distance(self, stations):
         """
-        Calculate the total distance traveled in a schedule.
+        Calculate the total distance traveled along a station sequence.
 
-        This function calculates the total distance traveled in a given schedule.
+        This function calculates the total distance traveled along the given
+        sequence of schedule stops.
 
         Parameters
         ----------
-        schedule : pd.DataFrame
-           A DataFrame representing a vehicle's schedule.
+        stations : np.ndarray
+           The station column of a schedule.
 
         Returns
         -------
@@ -470,13 +890,9 @@ class Pooling:
            The total distance traveled in the schedule.
 
         """
-        distance_list = []
-        for i in schedule.index:
-            if i == max(schedule.index):
-                continue
-            else:
-                start_id = schedule.at[i, "station"]
-                destination_id = schedule.at[i + 1, "station"]
-                distance_list.append(float(self.distance.loc[start_id, destination_id]))
-        distance = sum(distance_list)
-        return distance
+        idx = np.fromiter(
+            (self.station_index[station] for station in stations),
+            dtype=np.intp,
+            count=len(stations),
+        )
+        return float(self.distance_np[idx[:-1], idx[1:]].sum())
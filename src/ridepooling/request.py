@@ -1,3 +1,8 @@
+import math
+
+from ridepooling.schedule import to_minutes
+
+
 class Request:
     """
     Represents a ride request with attributes and methods for status management.
@@ -24,6 +29,18 @@ class Request:
         The maximum allowable delay for the ride request.
     waytime : float
         The estimated travel time between the start and destination.
+    start_idx : int
+        Row index of the starting station in the waytime matrix.
+    destination_idx : int
+        Row index of the destination station in the waytime matrix.
+    start_min : int
+        The start time in whole minutes since the epoch.
+    time_min : int
+        The request time in whole minutes since the epoch.
+    delay_max_min : int
+        The maximum allowable delay in whole minutes.
+    waytime_min : int
+        The estimated travel time rounded up to whole minutes.
 
     Methods
     -------
@@ -32,8 +49,38 @@ class Request:
 
     """
 
+    # one Request exists per ride, so dropping the per-instance __dict__
+    # noticeably shrinks memory for large request lists
+    __slots__ = (
+        "start",
+        "destination",
+        "request_id",
+        "start_time",
+        "passangers",
+        "status",
+        "time",
+        "delay_max",
+        "waytime",
+        "start_idx",
+        "destination_idx",
+        "start_min",
+        "time_min",
+        "delay_max_min",
+        "waytime_min",
+    )
+
     def __init__(
-        self, start_id, dest_id, id, start_time, passangers, time, delay_max, waytime
+        self,
+        start_id,
+        dest_id,
+        id,
+        start_time,
+        passangers,
+        time,
+        delay_max,
+        waytime,
+        start_idx,
+        dest_idx,
     ):
         """
         Initialize a Request object with the provided information.
@@ -56,6 +103,10 @@ class Request:
             The maximum allowable delay for the request.
         waytime : pd.DataFrame
             A DataFrame representing waytime information between stations.
+        start_idx : int
+            Row index of the starting station in the waytime matrix.
+        dest_idx : int
+            Row index of the destination station in the waytime matrix.
 
         Returns
         -------
@@ -74,6 +125,17 @@ class Request:
         self.delay_max = delay_max
         self.waytime = waytime
 
+        # integer station indexes into the waytime/distance matrices, so the
+        # pooling hot loops never translate station names per candidate
+        self.start_idx = start_idx
+        self.destination_idx = dest_idx
+
+        # integer minute representation used by the pooling hot loops
+        self.start_min = to_minutes(start_time)
+        self.time_min = to_minutes(time)
+        self.delay_max_min = int(delay_max)
+        self.waytime_min = math.ceil(waytime)
+
     def accept_status(self, decision):
         """
         Update the status of the request based on the decision made in the pooling process.
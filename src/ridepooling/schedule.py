@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+
+
+def to_minutes(moment):
+    """
+    Convert a datetime to minutes since the epoch.
+
+    Parameters
+    ----------
+    moment : datetime
+        A naive datetime object.
+
+    Returns
+    -------
+    int
+        The corresponding time as whole minutes since the epoch.
+
+    """
+    return int(np.datetime64(moment).astype("datetime64[s]").view(np.int64) // 60)
+
+
+@dataclass
+class ScheduleSoA:
+    """
+    Represents a vehicle schedule as a struct of parallel NumPy arrays.
+
+    One entry per stop. Keeping the columns as plain ndarrays instead of a
+    pandas DataFrame makes inserting candidate stops and propagating
+    occupation/delay cheap inside the pooling hot loops.
+
+    Attributes
+    ----------
+    station : np.ndarray
+        Station identifier per stop.
+    station_idx : np.ndarray
+        Row index of the station in the waytime and distance matrices.
+    boarding : np.ndarray
+        Number of passengers boarding (negative for alighting) per stop.
+    promissed : np.ndarray
+        Promised arrival time per stop in whole minutes since the epoch.
+    request_id : np.ndarray
+        Identifier of the request belonging to each stop.
+    planed : np.ndarray
+        Planned arrival time per stop in whole minutes since the epoch.
+    delay : np.ndarray
+        Delay per stop in whole minutes.
+    occupation : np.ndarray
+        Number of passengers on board after each stop.
+    max_delay : np.ndarray
+        Maximum allowed delay per stop in minutes.
+
+    """
+
+    station: np.ndarray
+    station_idx: np.ndarray
+    boarding: np.ndarray
+    promissed: np.ndarray
+    request_id: np.ndarray
+    planed: np.ndarray
+    delay: np.ndarray
+    occupation: np.ndarray
+    max_delay: np.ndarray
+
+    @classmethod
+    def empty(cls):
+        """
+        Create a schedule without any stops.
+
+        Returns
+        -------
+        ScheduleSoA
+            An empty schedule.
+
+        """
+        return cls(
+            station=np.empty(0, dtype=object),
+            station_idx=np.empty(0, dtype=np.intp),
+            boarding=np.empty(0, dtype=np.int64),
+            promissed=np.empty(0, dtype=np.int64),
+            request_id=np.empty(0, dtype=object),
+            planed=np.empty(0, dtype=np.int64),
+            delay=np.empty(0, dtype=np.int64),
+            occupation=np.empty(0, dtype=np.int64),
+            max_delay=np.empty(0, dtype=np.int64),
+        )
+
+    def __len__(self):
+        return len(self.station)
+
+    def insert_stops(
+        self,
+        positions,
+        stations,
+        station_idxs,
+        boardings,
+        promisseds,
+        request_ids,
+        planeds,
+        occupations,
+        max_delays,
+    ):
+        """
+        Return a copy of the schedule with several stops inserted at once.
+
+        All columns are built with a single ``np.insert`` call each, so the
+        schedule is copied once regardless of how many stops are added. The
+        positions refer to the schedule before insertion; for equal or
+        increasing positions later stops end up behind earlier ones.
+
+        Parameters
+        ----------
+        positions : list of int
+            Positions the stops are inserted at; existing stops from these
+            positions onwards move back.
+        stations : list
+            Station identifier per new stop.
+        station_idxs : list of int
+            Matrix row index per new stop.
+        boardings : list of int
+            Number of passengers boarding (negative for alighting) per new
+            stop.
+        promisseds : list of int
+            Promised arrival time per new stop in whole minutes since the
+            epoch.
+        request_ids : list of int
+            Identifier of the request each stop belongs to.
+        planeds : list of int
+            Initial planned arrival time per new stop in whole minutes since
+            the epoch.
+        occupations : list of int
+            Initial occupation value per new stop.
+        max_delays : list of int
+            Maximum allowed delay per new stop in minutes.
+
+        Returns
+        -------
+        ScheduleSoA
+            A new schedule containing the additional stops.
+
+        """
+        return ScheduleSoA(
+            station=np.insert(self.station, positions, stations),
+            station_idx=np.insert(self.station_idx, positions, station_idxs),
+            boarding=np.insert(self.boarding, positions, boardings),
+            promissed=np.insert(self.promissed, positions, promisseds),
+            request_id=np.insert(self.request_id, positions, request_ids),
+            planed=np.insert(self.planed, positions, planeds),
+            delay=np.insert(self.delay, positions, 0),
+            occupation=np.insert(self.occupation, positions, occupations),
+            max_delay=np.insert(self.max_delay, positions, max_delays),
+        )
+
+    def to_frame(self):
+        """
+        Convert the schedule to a pandas DataFrame for exports.
+
+        Returns
+        -------
+        pd.DataFrame
+            The schedule with the minute-based time columns converted back
+            to datetimes.
+
+        """
+        return pd.DataFrame(
+            {
+                "station": self.station,
+                "boarding": self.boarding,
+                "promissed_time": pd.to_datetime(self.promissed * 60, unit="s"),
+                "request_id": self.request_id,
+                "planed": pd.to_datetime(self.planed * 60, unit="s"),
+                "delay": self.delay,
+                "occupation": self.occupation,
+                "max_delay": self.max_delay,
+            }
+        )
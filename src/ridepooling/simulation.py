@@ -1,16 +1,73 @@
 import configparser as cp
+import functools
 import json
+import os
 import pathlib
-import pprint
 
+import numpy as np
 import pandas as pd
+import pyarrow.csv as pacsv
 from datetime import datetime
+from joblib import Parallel, delayed
 from ridepooling.request import Request
 from ridepooling.pooling import Pooling
 from ridepooling.vehicle import Vehicle
 from ridepooling.demand_calculation import Demand_calculation
 
 
+@functools.lru_cache(maxsize=8)
+def _load_matrix(path_str, mtime):
+    """
+    Read a station matrix CSV, cached per path and modification time.
+
+    Parameter sweeps create one Simulation per scenario over the same
+    network, so identical matrices are parsed only once per process. The
+    mtime key invalidates the cache when the file changes. Callers must
+    not mutate the returned frame.
+
+    Parameters
+    ----------
+    path_str : str
+        Path to the matrix CSV with the station names in the first
+        column.
+    mtime : float
+        Modification time of the file, part of the cache key.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The matrix with the station names as index.
+
+    """
+    frame = pacsv.read_csv(path_str).to_pandas()
+    return frame.set_index(frame.columns[0])
+
+
+def _export_one(vehicle, waytime_np, distance_np):
+    """
+    Export the schedule of a single vehicle.
+
+    Module-level worker so it can run in a joblib process pool; vehicles
+    and the matrix arrays pickle cheaply.
+
+    Parameters
+    ----------
+    vehicle : Vehicle
+        The vehicle whose schedule is exported.
+    waytime_np : np.ndarray
+        Waytime matrix between stations.
+    distance_np : np.ndarray
+        Distance matrix between stations.
+
+    Returns
+    -------
+    pd.DataFrame
+        The exported schedule of the vehicle.
+
+    """
+    return vehicle.export_schedule(waytime_np, distance_np)
+
+
 class Simulation:
     """
     Represents a simulation of a ride pooling system.
@@ -82,21 +139,25 @@ class Simulation:
 
         """
         self.cfg_dict = cfg_dict
-        self.waytime = pd.read_csv(
+        self.waytime = self.read_matrix(
             pathlib.Path(
                 cfg_dict["scenario_data_path"], cfg_dict["csv_paths"]["waytime_path"]
-            ),
-            header=0,
-            index_col=0,
+            )
         )
-        self.distance = pd.read_csv(
+        self.distance = self.read_matrix(
             pathlib.Path(
                 cfg_dict["scenario_data_path"], cfg_dict["csv_paths"]["distance_path"]
-            ),
-            header=0,
-            index_col=0,
+            )
         )
 
+        # plain ndarray views of the matrices plus a station -> row index
+        # mapping, so per-edge lookups skip the pandas label machinery
+        self.station_to_idx = {
+            station: i for i, station in enumerate(self.distance.index)
+        }
+        self.waytime_np = self.waytime.to_numpy(dtype=np.float64)
+        self.distance_np = self.distance.to_numpy(dtype=np.float64)
+
         self.vehicle_list = self.create_vehicle_objects(vehicles)
         self.station_list = self.create_station_list(self.distance)
         self.time_list = self.create_time_list(cfg_dict)
@@ -105,6 +166,28 @@ class Simulation:
         self.result_path = pathlib.Path(cfg_dict["scenario_data_path"], "results")
         self.result_path.mkdir(parents=True, exist_ok=True)
 
+    def read_matrix(self, path):
+        """
+        Read a station matrix CSV into a DataFrame indexed by station.
+
+        The multithreaded pyarrow CSV reader is considerably faster than
+        pandas for wide matrices, and the module-level cache avoids
+        re-parsing the same file across Simulation instances.
+
+        Parameters
+        ----------
+        path : pathlib.Path
+            Path to the matrix CSV with the station names in the first
+            column.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The matrix with the station names as index.
+
+        """
+        return _load_matrix(str(path), os.path.getmtime(path))
+
     def create_vehicle_objects(self, vehicles):
         """
         Create a list of vehicle objects based on input data.
@@ -219,34 +302,92 @@ class Simulation:
         -------
         None
         """
-        requests_frame = pd.read_csv(
+        # stream the CSV in chunks and filter every chunk down to the
+        # simulated period right away, so peak memory stays bounded by the
+        # chunk size plus the surviving rows
+        chunks = []
+        for chunk in pd.read_csv(
             pathlib.Path(
                 cfg_dict["scenario_data_path"], cfg_dict["csv_paths"]["requests_path"]
+            ),
+            chunksize=100_000,
+            usecols=[
+                "time",
+                "start_time",
+                "start_id",
+                "destination_id",
+                "passangers",
+                "id",
+            ],
+            parse_dates=["start_time", "time"],
+        ):
+            chunks.append(
+                chunk[
+                    chunk["start_time"].between(
+                        cfg_dict["start_date"], cfg_dict["end_date"]
+                    )
+                ]
             )
-        )
+        requests_frame = pd.concat(chunks)
         requests_frame = requests_frame.sort_values(by=["time"])
-        for index in requests_frame.index:
-            if (
-                cfg_dict["start_date"]
-                <= datetime.fromisoformat(requests_frame.at[index, "start_time"])
-                <= cfg_dict["end_date"]
-            ):
-                request = Request(
-                    requests_frame.at[index, "start_id"],
-                    requests_frame.at[index, "destination_id"],
-                    requests_frame.at[index, "id"],
-                    datetime.fromisoformat(requests_frame.at[index, "start_time"]),
-                    requests_frame.at[index, "passangers"],
-                    datetime.fromisoformat(requests_frame.at[index, "time"]),
-                    cfg_dict["weights"]["delay_max"],
-                    float(
-                        self.waytime.loc[
-                            requests_frame.at[index, "start_id"],
-                            requests_frame.at[index, "destination_id"],
-                        ]
-                    ),
-                )
-                self.request_list.append(request)
+
+        # gather all waytimes with one fancy-index lookup instead of a
+        # scalar .loc per row
+        station_index = {
+            name: i for i, name in enumerate(self.waytime.index)
+        }
+        start_idxs = requests_frame["start_id"].map(station_index).to_numpy()
+        destination_idxs = (
+            requests_frame["destination_id"].map(station_index).to_numpy()
+        )
+        waytimes = self.waytime.to_numpy()[start_idxs, destination_idxs]
+
+        delay_max = cfg_dict["weights"]["delay_max"]
+        for row, waytime, start_idx, destination_idx in zip(
+            requests_frame.itertuples(index=False),
+            waytimes,
+            start_idxs,
+            destination_idxs,
+        ):
+            request = Request(
+                row.start_id,
+                row.destination_id,
+                row.id,
+                row.start_time.to_pydatetime(),
+                row.passangers,
+                row.time.to_pydatetime(),
+                delay_max,
+                float(waytime),
+                int(start_idx),
+                int(destination_idx),
+            )
+            self.request_list.append(request)
+
+    def write_frame(self, frame, results_folder, name):
+        """
+        Write an export frame in the configured output format.
+
+        Parameters
+        ----------
+        frame : pd.DataFrame
+            The frame to write.
+        results_folder : pathlib.Path
+            The folder of the current simulation results.
+        name : str
+            File name without extension.
+
+        Returns
+        -------
+        None
+        """
+        if self.cfg_dict["outputs"].get("format", "csv") == "parquet":
+            frame.to_parquet(
+                pathlib.Path(results_folder, name + ".parquet"),
+                engine="pyarrow",
+                compression="snappy",
+            )
+        else:
+            frame.to_csv(pathlib.Path(results_folder, name + ".csv"))
 
     def export(self, Pooling_simulation):
         """
@@ -285,15 +426,25 @@ class Simulation:
                     "boarding",
                 ]
             )
-            for vehicle in self.vehicle_list:
-                export_schedule = pd.concat(
-                    [
-                        export_schedule,
-                        vehicle.export_schedule(self.waytime, self.distance),
-                    ]
+            # per-vehicle exports are independent - run them with one worker
+            # per vehicle when more than one job is configured
+            n_jobs = self.cfg_dict.get("n_jobs", 1)
+            if n_jobs != 1 and len(self.vehicle_list) > 1:
+                frames = Parallel(n_jobs=n_jobs, prefer="processes")(
+                    delayed(_export_one)(
+                        vehicle, self.waytime_np, self.distance_np
+                    )
+                    for vehicle in self.vehicle_list
                 )
-            schedule_path = pathlib.Path(results_folder, "schedule.csv")
-            export_schedule.to_csv(schedule_path)
+            else:
+                frames = [
+                    vehicle.export_schedule(self.waytime_np, self.distance_np)
+                    for vehicle in self.vehicle_list
+                ]
+            # concatenate all vehicle frames at once; the empty seed frame
+            # only pins the legacy column order
+            export_schedule = pd.concat([export_schedule] + frames)
+            self.write_frame(export_schedule, results_folder, "schedule")
 
         if self.cfg_dict["outputs"]["vehicle_outputs"] == True:
             for vehicle in self.vehicle_list:
@@ -301,7 +452,19 @@ class Simulation:
 
         # export requests
         if self.cfg_dict["outputs"]["requests_output"] == True:
+            rows = [
+                (
+                    request.time,
+                    request.start_time,
+                    request.start,
+                    request.destination,
+                    request.passangers,
+                    request.request_id,
+                )
+                for request in self.request_list
+            ]
             request_frame = pd.DataFrame(
+                rows,
                 columns=[
                     "time",
                     "start_time",
@@ -309,36 +472,25 @@ class Simulation:
                     "destination_id",
                     "passangers",
                     "id",
-                ]
+                ],
             )
-            for request in self.request_list:
-                frame = pd.DataFrame(
-                    [
-                        [
-                            request.time,
-                            request.start_time,
-                            request.start,
-                            request.destination,
-                            request.passangers,
-                            request.request_id,
-                        ]
-                    ],
-                    columns=[
-                        "time",
-                        "start_time",
-                        "start_id",
-                        "destination_id",
-                        "passangers",
-                        "id",
-                    ],
-                )
-                request_frame = pd.concat([request_frame, frame])
-            requests_path = pathlib.Path(results_folder, "requests.csv")
-            request_frame.to_csv(requests_path)
+            self.write_frame(request_frame, results_folder, "requests")
 
         # export denied requests
         if self.cfg_dict["outputs"]["requests_denied_output"] == True:
+            rows = [
+                (
+                    request.time,
+                    request.start_time,
+                    request.start,
+                    request.destination,
+                    request.passangers,
+                    request.request_id,
+                )
+                for request in Pooling_simulation.requests_denied_list
+            ]
             request_frame = pd.DataFrame(
+                rows,
                 columns=[
                     "time",
                     "start_time",
@@ -346,81 +498,56 @@ class Simulation:
                     "destination_id",
                     "passangers",
                     "id",
-                ]
+                ],
             )
-            for request in Pooling_simulation.requests_denied_list:
-                frame = pd.DataFrame(
-                    [
-                        [
-                            request.time,
-                            request.start_time,
-                            request.start,
-                            request.destination,
-                            request.passangers,
-                            request.request_id,
-                        ]
-                    ],
-                    columns=[
-                        "time",
-                        "start_time",
-                        "start_id",
-                        "destination_id",
-                        "passangers",
-                        "id",
-                    ],
-                )
-                request_frame = pd.concat([request_frame, frame])
-            requests_path = pathlib.Path(results_folder, "requests_denied.csv")
-            request_frame.to_csv(requests_path)
+            self.write_frame(request_frame, results_folder, "requests_denied")
 
         # summary
         if self.cfg_dict["outputs"]["summary"] == True:
             summary_dict = {}
-            vehicles = {"vehicles": {}}
-            for vehicle in self.vehicle_list:
-                schedule_veh = export_schedule.loc[
-                    export_schedule["vehicle_id"] == vehicle.id
-                ]
-                distance_total = sum(schedule_veh["distance"])
-                distance_occupied = sum(
-                    schedule_veh.loc[schedule_veh["occupation"] > 0]["distance"]
-                )
-                passanger_distance = (
-                    schedule_veh.loc[schedule_veh["occupation"] > 0]["distance"]
-                    * schedule_veh.loc[schedule_veh["occupation"] > 0]["occupation"]
+
+            # aggregate all per-vehicle figures in one groupby pass instead
+            # of filtering the schedule once per vehicle and metric
+            distance = export_schedule["distance"].to_numpy(dtype=np.float64)
+            occupation = export_schedule["occupation"].to_numpy(dtype=np.float64)
+            occupied = occupation > 0
+            grouped = (
+                export_schedule.assign(
+                    distance=distance,
+                    distance_occupied=np.where(occupied, distance, 0.0),
+                    passanger_distance=np.where(
+                        occupied, distance * occupation, 0.0
+                    ),
                 )
-                entry = {
-                    vehicle.id: {
-                        "distance_total": distance_total,
-                        "distance_occupied": distance_occupied,
-                        "passanger_distance": sum(passanger_distance),
-                    }
+                .groupby("vehicle_id")[
+                    ["distance", "distance_occupied", "passanger_distance"]
+                ]
+                .sum()
+                .reindex([vehicle.id for vehicle in self.vehicle_list], fill_value=0.0)
+            )
+
+            vehicles = {"vehicles": {}}
+            for vehicle_id, row in grouped.iterrows():
+                vehicles["vehicles"][vehicle_id] = {
+                    "distance_total": row["distance"],
+                    "distance_occupied": row["distance_occupied"],
+                    "passanger_distance": row["passanger_distance"],
                 }
-                vehicles["vehicles"].update(entry)
 
-            distance_total = sum(export_schedule["distance"])
-            distance_occupied = sum(
-                export_schedule.loc[export_schedule["occupation"] > 0]["distance"]
-            )
-            passanger_distance = (
-                export_schedule.loc[export_schedule["occupation"] > 0]["distance"]
-                * export_schedule.loc[export_schedule["occupation"] > 0]["occupation"]
-            )
+            totals = grouped.sum()
             total = {
                 "total": {
-                    "distance_total": distance_total,
-                    "distance_occupied": distance_occupied,
-                    "passanger_distance": sum(passanger_distance),
+                    "distance_total": totals["distance"],
+                    "distance_occupied": totals["distance_occupied"],
+                    "passanger_distance": totals["passanger_distance"],
                 }
             }
             summary_dict.update(total)
             summary_dict.update(vehicles)
 
-            # json_file = json.dump(summary_dict, indent=4)
             summary_path = pathlib.Path(results_folder, "summary.json")
-            pretty_print_json = pprint.pformat(summary_dict)
             with open(summary_path, "w") as outfile:
-                outfile.write(pretty_print_json)
+                json.dump(summary_dict, outfile, indent=4, default=float)
 
     @classmethod
     def from_config(cls, config_path):
@@ -482,6 +609,9 @@ class Simulation:
             "standing_time": cfg.getfloat("basic", "standing_time", fallback=1.0)
         }
 
+        n_jobs = cfg.getint("pooling", "n_jobs", fallback=1)
+        batch_interval = cfg.getfloat("pooling", "batch_interval", fallback=0.0)
+
         order_behaviour = {
             "order_behaviour": cfg.getfloat("order_behaviour", "order_behaviour", fallback=0.1),
             "order_ahead_min": cfg.getfloat("order_behaviour", "order_ahead_min", fallback=20.0),
@@ -513,6 +643,7 @@ class Simulation:
             "requests_denied_output": cfg.getboolean(
                 "outputs", "requests_denied_output", fallback=True
             ),
+            "format": cfg.get("outputs", "format", fallback="csv"),
         }
 
         cfg_dict = {
@@ -520,6 +651,8 @@ class Simulation:
             "end_date": end_date,
             "requests_from_csv": requests_from_csv,
             "weights": weights,
+            "n_jobs": n_jobs,
+            "batch_interval": batch_interval,
             "scenario_data_path": scenario_data_path,
             "config_path": config_path,
             "order_behaviour": order_behaviour,
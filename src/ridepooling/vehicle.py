@@ -1,8 +1,9 @@
+import numpy as np
 import pandas as pd
-from datetime import date, datetime, timedelta
-import os
 import pathlib
 
+from ridepooling.schedule import ScheduleSoA
+
 
 class Vehicle:
     """
@@ -24,8 +25,8 @@ class Vehicle:
         The current location of the vehicle.
     passangers : int
         The number of passengers in the vehicle.
-    schedule : pd.DataFrame
-        A DataFrame representing the planned schedule of the vehicle.
+    schedule : ScheduleSoA
+        The planned schedule of the vehicle as parallel arrays of stops.
 
     Methods
     -------
@@ -39,6 +40,17 @@ class Vehicle:
         Export a summary of the vehicle's schedule to a CSV file.
     """
 
+    __slots__ = (
+        "id",
+        "name",
+        "seats",
+        "type",
+        "location",
+        "passangers",
+        "schedule",
+        "traveltime",
+    )
+
     def __init__(self, id, name, seats, type):
         """
         Initialize a Vehicle object with the provided information.
@@ -65,38 +77,29 @@ class Vehicle:
         self.type = type
         self.location = 1
         self.passangers = 0
-        self.schedule = pd.DataFrame(
-            columns=[
-                "station",
-                "boarding",
-                "promissed_time",
-                "request_id",
-                "planed",
-                "delay",
-                "occupation",
-                "max_delay",
-            ]
-        )
+        self.schedule = ScheduleSoA.empty()
 
     def update_schedule(self, schedule_new):
         """
         Update the vehicle's schedule with a new schedule.
 
+        The winning candidate already contains the previous stops, so the
+        update is a plain rebind of the schedule arrays without copying or
+        index alignment.
+
         Parameters
         ----------
-        schedule_new : pd.DataFrame
-            A new schedule to be merged with the vehicle's existing schedule.
+        schedule_new : ScheduleSoA
+            The new schedule replacing the vehicle's existing schedule.
 
         Returns
         -------
         None
 
         """
-        self.schedule = pd.concat(
-            [self.schedule[~self.schedule.index.isin(schedule_new.index)], schedule_new]
-        )
+        self.schedule = schedule_new
 
-    def calculating_time(self, id_start, id_end, timetable):
+    def calculating_time(self, id_start, id_end, timetable, station_to_idx):
         """
         Calculate travel time between two station IDs.
 
@@ -106,8 +109,10 @@ class Vehicle:
             The ID of the starting station.
         id_end : int
             The ID of the destination station.
-        timetable : pd.DataFrame
-            A DataFrame containing travel time information between stations.
+        timetable : np.ndarray
+            The waytime matrix between stations.
+        station_to_idx : dict
+            Mapping from station identifier to matrix row index.
 
         Returns
         -------
@@ -115,19 +120,19 @@ class Vehicle:
             The calculated travel time in minutes.
 
         """
-        self.traveltime = timetable.at[id_start, str(id_end)]
+        self.traveltime = timetable[station_to_idx[id_start], station_to_idx[id_end]]
         return self.traveltime
 
-    def export_schedule(self, waytime, distance):
+    def export_schedule(self, waytime_np, distance_np):
         """
         Export the vehicle's schedule with additional details.
 
         Parameters
         ----------
-        waytime : pd.DataFrame
-            A DataFrame representing waytime data between stations.
-        distance : pd.DataFrame
-            A DataFrame representing distance data between stations.
+        waytime_np : np.ndarray
+            The waytime matrix between stations.
+        distance_np : np.ndarray
+            The distance matrix between stations.
 
         Returns
         -------
@@ -135,12 +140,65 @@ class Vehicle:
             A DataFrame containing the exported schedule with added details.
 
         """
-        path = os.path.dirname(__file__)
-        timetable = waytime
-        distance_table = distance
+        # read the schedule columns directly instead of materializing a
+        # DataFrame and fetching every cell through .at
+        stations = self.schedule.station
+        boarding = self.schedule.boarding
+        occupation = self.schedule.occupation
+        request_arr = self.schedule.request_id
+        planed_dt = pd.to_datetime(self.schedule.planed * 60, unit="s")
+
+        # a segment ends wherever two consecutive stops differ; same-station
+        # rows only contribute their request id to the following segment and
+        # a trailing same-station run is dropped, matching the old row loop
+        boundary_idx = np.flatnonzero(stations[:-1] != stations[1:])
+        groups = np.split(np.arange(len(stations) - 1), boundary_idx + 1)
+
+        # only string assembly is left at Python level; one join per segment
+        # keeps it linear in the number of concatenated ids
+        request_id_strings = [
+            "-".join(str(request_arr[index]) for index in group) + "-"
+            for group in groups[: len(boundary_idx)]
+        ]
+
+        # gather the per-segment columns with array operations; the matrix
+        # row indexes are stored alongside the station names
+        station_idx = self.schedule.station_idx
+        departure_idx = station_idx[boundary_idx]
+        arrival_idx = station_idx[boundary_idx + 1]
+        driving_times = waytime_np[departure_idx, arrival_idx]
+        distances = distance_np[departure_idx, arrival_idx]
+        # bulk datetime64 arithmetic plus one strftime per column instead of
+        # a timedelta allocation and format call per row
+        arrival_dt = planed_dt[boundary_idx + 1]
+        arrival_times = arrival_dt.strftime("%Y-%m-%d %H:%M:%S")
+        departure_times = (
+            arrival_dt - pd.to_timedelta(driving_times, unit="m")
+        ).strftime("%Y-%m-%d %H:%M:%S")
+
+        rows = [
+            [
+                self.id,
+                boarding[index],
+                stations[index],
+                departure_times[segment],
+                arrival_times[segment],
+                stations[index + 1],
+                boarding[index + 1],
+                distances[segment],
+                driving_times[segment],
+                None,
+                self.type,
+                request_id_strings[segment],
+                occupation[index],
+            ]
+            for segment, index in enumerate(boundary_idx)
+        ]
 
-        # creating Data Frame
+        # dtype=object keeps the mixed-type column layout of the previous
+        # row-wise construction
         exp_schedule = pd.DataFrame(
+            rows,
             columns=[
                 "vehicle_id",
                 "boarding_start",
@@ -155,107 +213,19 @@ class Vehicle:
                 "vehicle_type",
                 "request_ids",
                 "occupation",
-            ]
+            ],
+            dtype=object,
         )
 
-        # initializing variables
-        request_ids = ""
-
-        # looping schedule
-        for index in self.schedule.index:
-            if index != max(self.schedule.index):
-                if (
-                    self.schedule.at[index, "station"]
-                    == self.schedule.at[index + 1, "station"]
-                ):
-                    request_ids = (
-                        request_ids + str(self.schedule.at[index, "request_id"]) + "-"
-                    )
-                else:
-                    vehicle_id = self.id
-                    boarding_start = self.schedule.at[index, "boarding"]
-                    departure_name = self.schedule.at[index, "station"]
-                    arrival_name = self.schedule.at[index + 1, "station"]
-                    boarding_dest = self.schedule.at[index + 1, "boarding"]
-                    driving_time = self.calculating_time(
-                        departure_name, arrival_name, timetable
-                    )
-                    departure_time = (
-                        self.schedule.at[index + 1, "planed"]
-                        - timedelta(minutes=float(driving_time))
-                    ).strftime("%Y-%m-%d %H:%M:%S")
-                    arrival_time = self.schedule.at[index + 1, "planed"].strftime(
-                        "%Y-%m-%d %H:%M:%S"
-                    )
-                    distance = distance_table.at[departure_name, str(arrival_name)]
-                    pause = None
-                    vehicle_type = self.type
-                    request_ids = (
-                        request_ids + str(self.schedule.at[index, "request_id"]) + "-"
-                    )
-                    occupation = self.schedule.at[index, "occupation"]
-                    export_line = pd.DataFrame(
-                        [
-                            [
-                                vehicle_id,
-                                boarding_start,
-                                departure_name,
-                                departure_time,
-                                arrival_time,
-                                arrival_name,
-                                boarding_dest,
-                                distance,
-                                driving_time,
-                                pause,
-                                vehicle_type,
-                                request_ids,
-                                occupation,
-                            ]
-                        ],
-                        columns=[
-                            "vehicle_id",
-                            "boarding_start",
-                            "departure_name",
-                            "departure_time",
-                            "arrival_time",
-                            "arrival_name",
-                            "boarding_dest",
-                            "distance",
-                            "driving_time",
-                            "pause",
-                            "vehicle_type",
-                            "request_ids",
-                            "occupation",
-                        ],
-                    )
-                    # set variables 0
-                    request_ids = ""
-
-                    # fit together
-                    exp_schedule = pd.concat(
-                        [exp_schedule, export_line], ignore_index=True
-                    )
-
-        # Calculating pause times
-        for index in exp_schedule.index:
-            if index != max(exp_schedule.index):
-                if datetime.fromisoformat(
-                    exp_schedule.loc[index + 1]["departure_time"]
-                ) == datetime.fromisoformat(exp_schedule.loc[index]["arrival_time"]):
-                    pause_time = 0
-                elif datetime.fromisoformat(
-                    exp_schedule.loc[index + 1]["departure_time"]
-                ) < datetime.fromisoformat(exp_schedule.loc[index]["arrival_time"]):
-                    pause_time = 0
-                else:
-                    pause_time = (
-                        datetime.fromisoformat(
-                            exp_schedule.at[index + 1, "departure_time"]
-                        )
-                        - datetime.fromisoformat(exp_schedule.at[index, "arrival_time"])
-                    ).seconds // 60
-                exp_schedule.loc[[index], ["pause"]] = pause_time
-            exp_schedule.loc[[max(exp_schedule.index)], "pause"] = 0
+        # Calculating pause times: parse both time columns once and take the
+        # clipped difference between consecutive rows; no per-row index
+        # scans are needed - the last row has no following departure and
+        # gets a pause of zero
+        if len(exp_schedule) != 0:
+            departure = pd.to_datetime(exp_schedule["departure_time"]).to_numpy()
+            arrival = pd.to_datetime(exp_schedule["arrival_time"]).to_numpy()
+            pause = (departure[1:] - arrival[:-1]) // np.timedelta64(60, "s")
+            exp_schedule["pause"] = np.append(np.clip(pause, 0, None), 0)
         return exp_schedule
 
     def export_summary(self, path):
@@ -273,4 +243,4 @@ class Vehicle:
 
         """
         filename = pathlib.Path(path, "vehicle_id" + str(self.id) + ".csv")
-        self.schedule.to_csv(filename)
+        self.schedule.to_frame().to_csv(filename)